@@ -1,4 +1,118 @@
-from typing import Set, Dict, Tuple, List, Optional, Union
+import collections.abc
+from array import array
+from itertools import accumulate
+from typing import AbstractSet, Set, Dict, Tuple, List, Optional, Iterable, Union
+
+
+def _reach(indptr: array, indices: array, start: int, end: int, seen: bytearray) -> bool:
+    seen[start] = 1
+    stack = [start]
+    pop, push = stack.pop, stack.append
+    while stack:
+        v = pop()
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if not seen[w]:
+                if w == end:
+                    return True
+                seen[w] = 1
+                push(w)
+    return False
+
+
+def _transitive_closure(indptr: array, indices: array) -> Tuple[array, List[int]]:
+    """
+    Condense a CSR graph into strongly connected components (iterative Tarjan) and
+    return (scc_of, reach), where bit d of reach[c] is set iff component d is
+    reachable from component c. Tarjan emits components in reverse topological
+    order, so each row is the OR of rows that are already complete.
+    """
+    n = len(indptr) - 1
+    order = array('i', [-1]) * n
+    low = array('i', [0]) * n
+    scc_of = array('i', [-1]) * n
+    on_stack = bytearray(n)
+    stack: List[int] = []
+    reach: List[int] = []
+    counter = 0
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [[root, indptr[root]]]
+        while work:
+            frame = work[-1]
+            v, pos = frame
+            if pos < indptr[v + 1]:
+                frame[1] = pos + 1
+                w = indices[pos]
+                if order[w] == -1:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append([w, indptr[w]])
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+                continue
+            work.pop()
+            if work and low[v] < low[work[-1][0]]:
+                low[work[-1][0]] = low[v]
+            if low[v] != order[v]:
+                continue
+            c = len(reach)
+            bits = 1 << c
+            members = []
+            while True:
+                w = stack.pop()
+                on_stack[w] = 0
+                scc_of[w] = c
+                members.append(w)
+                if w == v:
+                    break
+            for w in members:
+                for x in indices[indptr[w]:indptr[w + 1]]:
+                    if scc_of[x] != c:
+                        bits |= reach[scc_of[x]]
+            reach.append(bits)
+    return scc_of, reach
+
+
+class _SetView(collections.abc.Set):
+    """
+    Read-only, live view of one of the HAG's internal sets. The HAG caches derived
+    data (the CSR index, rendered text), so changes must go through its methods.
+    """
+
+    __slots__ = ("_items",)
+    _READ_METHODS = frozenset(("copy", "difference", "intersection", "isdisjoint",
+                               "issubset", "issuperset", "symmetric_difference", "union"))
+
+    def __init__(self, items: Set) -> None:
+        self._items = items
+
+    def __contains__(self, item: object) -> bool:
+        return item in self._items
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __repr__(self) -> str:
+        return repr(self._items)
+
+    def __getattr__(self, name: str):
+        if name in _SetView._READ_METHODS:
+            return getattr(self._items, name)
+        raise AttributeError(f"read-only HAG view has no attribute {name!r}; use the HAG methods to modify it")
+
+    @classmethod
+    def _from_iterable(cls, it: Iterable) -> Set:
+        return set(it)
 
 
 class HAG:
@@ -7,70 +121,150 @@ class HAG:
     A structured, multi-level graph model with support for hyper-vertices, constraints, and abstraction operations.
     """
 
+    __slots__ = (
+        "_vertices", "_edges", "_hyper_vertices", "_constraints",
+        "_name_to_iloc", "_names", "_indptr", "_indices", "_closure",
+        "_version", "_str_cache",
+    )
+
     def __init__(self) -> None:
         self._vertices: Set[str] = set()
         self._edges: Set[Tuple[str, str, str]] = set()  # (source, target, label)
         self._hyper_vertices: Dict[str, Set[str]] = {}
-        self._constraints: List[str] = []
+        self._constraints: Dict[str, None] = {}  # insertion-ordered set
+        # CSR index over the edges, built on demand: the targets of vertex i are
+        # _names[j] for j in _indices[_indptr[i]:_indptr[i + 1]]
+        self._name_to_iloc: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._indptr: Optional[array] = None
+        self._indices: array = array('i')
+        # Reachability closure over the index, only built by precompute_reachability()
+        self._closure: Optional[Tuple[array, List[int]]] = None
+        self._version = 0  # bumped on every structural change
+        self._str_cache: Optional[Tuple[int, str, str]] = None
 
     # --- Properties ---
     @property
-    def vertices(self) -> Set[str]:
-        return self._vertices
+    def vertices(self) -> AbstractSet[str]:
+        return _SetView(self._vertices)
 
     @property
-    def edges(self) -> Set[Tuple[str, str, str]]:
-        return self._edges
+    def edges(self) -> AbstractSet[Tuple[str, str, str]]:
+        return _SetView(self._edges)
 
     @property
     def hyper_vertices(self) -> Dict[str, Set[str]]:
         return self._hyper_vertices
 
     @property
-    def constraints(self) -> List[str]:
-        return self._constraints
+    def constraints(self) -> Tuple[str, ...]:
+        return tuple(self._constraints)
 
     # --- Add Methods ---
     def add_vertex(self, vertex: str) -> None:
         self._vertices.add(vertex)
+        self._version += 1
 
     def add_edge(self, source: str, target: str, label: str = "") -> None:
         self._edges.add((source, target, label))
+        self._indptr = None
+        self._version += 1
+
+    def add_edges(self, edges: Iterable[Tuple[str, ...]]) -> None:
+        """Add many edges in one batch; each item is (source, target) or (source, target, label)."""
+        batch = edges if isinstance(edges, (list, tuple, set, frozenset)) else list(edges)
+        if min(map(len, batch), default=3) < 3:
+            # Slow path only when some items are (source, target) pairs
+            batch = [(e[0], e[1], e[2] if len(e) > 2 else "") for e in batch]
+        self._edges.update(batch)
+        self._indptr = None
+        self._version += 1
 
     def add_hyper_vertex(self, name: str, members: Set[str]) -> None:
         self._hyper_vertices[name] = members
+        self._version += 1
 
     def add_constraint(self, constraint: str) -> None:
-        self._constraints.append(constraint)
+        self._constraints[constraint] = None
 
     # --- Graph Logic ---
+    def _ensure_index(self) -> None:
+        if self._indptr is not None:
+            return
+        ilocs: Dict[str, int] = {}
+        src, tgt = array('i'), array('i')
+        for s, t, _ in self._edges:
+            src.append(ilocs.setdefault(s, len(ilocs)))
+            tgt.append(ilocs.setdefault(t, len(ilocs)))
+        degree = array('i', [0]) * len(ilocs)
+        for i in src:
+            degree[i] += 1
+        indptr = array('i', accumulate(degree, initial=0))
+        indices = array('i', [0]) * len(src)
+        fill = indptr[:-1]
+        for i, j in zip(src, tgt):
+            indices[fill[i]] = j
+            fill[i] += 1
+        self._name_to_iloc = ilocs
+        self._names = list(ilocs)
+        self._indptr = indptr
+        self._indices = indices
+        self._closure = None
+
     def get_neighbors(self, vertex: str) -> List[str]:
-        return [target for (source, target, _) in self._edges if source == vertex]
+        self._ensure_index()
+        i = self._name_to_iloc.get(vertex)
+        if i is None:
+            return []
+        names = self._names
+        return [names[j] for j in self._indices[self._indptr[i]:self._indptr[i + 1]]]
 
     def path_exists(self, start: str, end: str, visited: Optional[Set[str]] = None) -> bool:
-        if visited is None:
-            visited = set()
         if start == end:
             return True
-        visited.add(start)
-        for neighbor in self.get_neighbors(start):
-            if neighbor not in visited and self.path_exists(neighbor, end, visited):
-                return True
-        return False
+        self._ensure_index()
+        ilocs = self._name_to_iloc
+        if start not in ilocs or end not in ilocs:
+            return False
+        if visited:
+            # As in the original recursive version, the start vertex is always expanded
+            # even if the caller already lists it as visited
+            seen = bytearray(len(ilocs))
+            for v in visited:
+                if v in ilocs and v != start:
+                    seen[ilocs[v]] = 1
+            return _reach(self._indptr, self._indices, ilocs[start], ilocs[end], seen)
+        if self._closure is None:
+            return _reach(self._indptr, self._indices, ilocs[start], ilocs[end], bytearray(len(ilocs)))
+        scc_of, reach = self._closure
+        return bool(reach[scc_of[ilocs[start]]] >> scc_of[ilocs[end]] & 1)
+
+    def precompute_reachability(self) -> None:
+        """
+        Precompute the full reachability closure so that later path_exists calls are
+        O(1) bit tests. It needs O(V^2) bits, so only use it for many queries on a
+        graph of moderate size; it is discarded whenever the edges change.
+        """
+        self._ensure_index()
+        if self._closure is None:
+            self._closure = _transitive_closure(self._indptr, self._indices)
 
     def collapse_hyper_vertex(self, name: str) -> None:
         """Replaces all members of a hyper vertex with the hyper vertex name in edges."""
         if name not in self._hyper_vertices:
             return
-        members = self._hyper_vertices[name]
-        new_edges = set()
-        for (v1, v2, label) in self._edges:
-            new_v1 = name if v1 in members else v1
-            new_v2 = name if v2 in members else v2
-            new_edges.add((new_v1, new_v2, label))
-        self._edges = new_edges
+        members = frozenset(self._hyper_vertices[name])
+        touched = [e for e in self._edges if e[0] in members or e[1] in members]
+        if touched:
+            self._edges.difference_update(touched)
+            self._edges |= {
+                (name if v1 in members else v1, name if v2 in members else v2, label)
+                for v1, v2, label in touched
+            }
+            self._indptr = None
         self._vertices -= members
         self._vertices.add(name)
+        self._version += 1
 
     # --- Graph Operations ---
     def union(self, other: 'HAG') -> 'HAG':
@@ -78,7 +272,7 @@ class HAG:
         result._vertices = self._vertices | other._vertices
         result._edges = self._edges | other._edges
         result._hyper_vertices = {**self._hyper_vertices, **other._hyper_vertices}
-        result._constraints = list(set(self._constraints + other._constraints))
+        result._constraints = {**self._constraints, **other._constraints}
         return result
 
     def intersection(self, other: 'HAG') -> 'HAG':
@@ -89,7 +283,7 @@ class HAG:
             k: v for k, v in self._hyper_vertices.items()
             if k in other._hyper_vertices and v == other._hyper_vertices[k]
         }
-        result._constraints = list(set(self._constraints) & set(other._constraints))
+        result._constraints = {c: None for c in self._constraints if c in other._constraints}
         return result
 
     def subtract(self, other: 'HAG') -> 'HAG':
@@ -100,17 +294,22 @@ class HAG:
             k: v for k, v in self._hyper_vertices.items()
             if k not in other._hyper_vertices
         }
-        result._constraints = [c for c in self._constraints if c not in other._constraints]
+        result._constraints = {c: None for c in self._constraints if c not in other._constraints}
         return result
 
     # --- Display ---
     def __str__(self) -> str:
+        if self._str_cache is None or self._str_cache[0] != self._version:
+            vertices = ", ".join(map(str, sorted(self._vertices)))
+            edges = "".join(f"\n  {s} -{l}-> {t}" for s, t, l in sorted(self._edges))
+            self._str_cache = (self._version, vertices, edges)
+        _, vertices, edges = self._str_cache
         return (
             f"HAG Model\n"
-            f"Vertices: {sorted(self._vertices)}\n"
-            f"Edges: {sorted(self._edges)}\n"
+            f"Vertices: {vertices}\n"
+            f"Edges:{edges}\n"
             f"Hyper-Vertices: {self._hyper_vertices}\n"
-            f"Constraints: {self._constraints}"
+            f"Constraints: {list(self._constraints)}"
         )
 if __name__ == "__main__":
     hag = HAG()
@@ -1,4 +1,7 @@
-from typing import Set, Dict, Tuple, List, Optional
+from array import array
+from itertools import accumulate
+from operator import itemgetter
+from typing import Set, Dict, Tuple, List, Optional, Iterable
 import networkx as nx
 import matplotlib.pyplot as plt
 from pyvis.network import Network
@@ -6,6 +9,87 @@ import os
 import webbrowser
 
 
+# spring_layout is O(iterations * V^2); above this size fall back to a random layout
+SPRING_LAYOUT_MAX_NODES = 500
+
+
+def _reach(indptr: array, indices: array, start: int, end: int, seen: bytearray) -> bool:
+    """Iterative DFS over a CSR index; vertices flagged in the `seen` bytemap are skipped."""
+    seen[start] = 1
+    stack = [start]
+    pop, push = stack.pop, stack.append
+    while stack:
+        v = pop()
+        for w in indices[indptr[v]:indptr[v + 1]]:
+            if not seen[w]:
+                if w == end:
+                    return True
+                seen[w] = 1
+                push(w)
+    return False
+
+
+def _transitive_closure(indptr: array, indices: array) -> Tuple[array, List[int]]:
+    """
+    Condense a CSR graph into strongly connected components (iterative Tarjan) and
+    return (scc_of, reach), where bit d of reach[c] is set iff component d is
+    reachable from component c. Tarjan emits components in reverse topological
+    order, so each row is the OR of rows that are already complete.
+    """
+    n = len(indptr) - 1
+    order = array('i', [-1]) * n
+    low = array('i', [0]) * n
+    scc_of = array('i', [-1]) * n
+    on_stack = bytearray(n)
+    stack: List[int] = []
+    reach: List[int] = []
+    counter = 0
+    for root in range(n):
+        if order[root] != -1:
+            continue
+        order[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack[root] = 1
+        work = [[root, indptr[root]]]
+        while work:
+            frame = work[-1]
+            v, pos = frame
+            if pos < indptr[v + 1]:
+                frame[1] = pos + 1
+                w = indices[pos]
+                if order[w] == -1:
+                    order[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack[w] = 1
+                    work.append([w, indptr[w]])
+                elif on_stack[w] and order[w] < low[v]:
+                    low[v] = order[w]
+                continue
+            work.pop()
+            if work and low[v] < low[work[-1][0]]:
+                low[work[-1][0]] = low[v]
+            if low[v] != order[v]:
+                continue
+            c = len(reach)
+            bits = 1 << c
+            members = []
+            while True:
+                w = stack.pop()
+                on_stack[w] = 0
+                scc_of[w] = c
+                members.append(w)
+                if w == v:
+                    break
+            for w in members:
+                for x in indices[indptr[w]:indptr[w + 1]]:
+                    if scc_of[x] != c:
+                        bits |= reach[scc_of[x]]
+            reach.append(bits)
+    return scc_of, reach
+
+
 class HAG:
     """
     Hierarchical Abstraction Graph (HAG)
@@ -18,11 +102,28 @@ class HAG:
         - Static and interactive visualization
     """
 
+    __slots__ = (
+        "_vertices", "_edges", "_hyper_vertices", "_constraints",
+        "_name_to_iloc", "_names", "_indptr", "_indices", "_closure",
+        "_version", "_nx_cache", "_str_cache",
+    )
+
     def __init__(self) -> None:
         self._vertices: Set[str] = set()
         self._edges: Set[Tuple[str, str, str]] = set()  # (source, target, label)
         self._hyper_vertices: Dict[str, Set[str]] = {}  # name -> members
         self._constraints: List[str] = []
+        # CSR index over the edges, built on demand: the targets of vertex i are
+        # _names[j] for j in _indices[_indptr[i]:_indptr[i + 1]]
+        self._name_to_iloc: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._indptr: Optional[array] = None
+        self._indices: array = array('i')
+        # Reachability closure over the index, only built by precompute_reachability()
+        self._closure: Optional[Tuple[array, List[int]]] = None
+        self._version = 0  # bumped on every structural change
+        self._nx_cache: Optional[Tuple[int, nx.DiGraph, Dict[str, Tuple[float, float]], Dict[Tuple[str, str], str]]] = None
+        self._str_cache: Optional[Tuple[int, str, str]] = None
 
     # ----------------------------
     # Graph Construction
@@ -31,16 +132,32 @@ class HAG:
     def add_vertex(self, vertex: str) -> None:
         """Add a single vertex."""
         self._vertices.add(vertex)
+        self._version += 1
 
     def add_edge(self, source: str, target: str, label: str = "") -> None:
         """Add a directed edge with optional label."""
         self._edges.add((source, target, label))
-        self._vertices.update([source, target])
+        self._indptr = None
+        self._vertices.add(source)
+        self._vertices.add(target)
+        self._version += 1
+
+    def add_edges(self, edges: Iterable[Tuple[str, ...]]) -> None:
+        """Add many edges in one batch; each item is (source, target) or (source, target, label)."""
+        batch = edges if isinstance(edges, (list, tuple, set, frozenset)) else list(edges)
+        if min(map(len, batch), default=3) < 3:
+            # Slow path only when some items are (source, target) pairs
+            batch = [(e[0], e[1], e[2] if len(e) > 2 else "") for e in batch]
+        self._edges.update(batch)
+        self._vertices.update(map(itemgetter(0), batch), map(itemgetter(1), batch))
+        self._indptr = None
+        self._version += 1
 
     def add_hyper_vertex(self, name: str, members: Set[str]) -> None:
         """Define a hyper-vertex that groups existing vertices or hyper-vertices."""
         self._hyper_vertices[name] = members
         self._vertices.add(name)
+        self._version += 1
 
     def add_constraint(self, constraint: str) -> None:
         """Add a constraint (stored only, not enforced)."""
@@ -50,21 +167,69 @@ class HAG:
     # Graph Logic
     # ----------------------------
 
+    def _ensure_index(self) -> None:
+        """Build the integer CSR index from the edge set if it is stale."""
+        if self._indptr is not None:
+            return
+        ilocs: Dict[str, int] = {}
+        src, tgt = array('i'), array('i')
+        for s, t, _ in self._edges:
+            src.append(ilocs.setdefault(s, len(ilocs)))
+            tgt.append(ilocs.setdefault(t, len(ilocs)))
+        degree = array('i', [0]) * len(ilocs)
+        for i in src:
+            degree[i] += 1
+        indptr = array('i', accumulate(degree, initial=0))
+        indices = array('i', [0]) * len(src)
+        fill = indptr[:-1]
+        for i, j in zip(src, tgt):
+            indices[fill[i]] = j
+            fill[i] += 1
+        self._name_to_iloc = ilocs
+        self._names = list(ilocs)
+        self._indptr = indptr
+        self._indices = indices
+        self._closure = None
+
     def get_neighbors(self, vertex: str) -> List[str]:
         """Return the list of direct neighbors of a vertex."""
-        return [t for (s, t, _) in self._edges if s == vertex]
+        self._ensure_index()
+        i = self._name_to_iloc.get(vertex)
+        if i is None:
+            return []
+        names = self._names
+        return [names[j] for j in self._indices[self._indptr[i]:self._indptr[i + 1]]]
 
     def path_exists(self, start: str, end: str, visited: Optional[Set[str]] = None) -> bool:
         """Check if a path exists between two vertices (DFS traversal)."""
-        if visited is None:
-            visited = set()
         if start == end:
             return True
-        visited.add(start)
-        for neighbor in self.get_neighbors(start):
-            if neighbor not in visited and self.path_exists(neighbor, end, visited):
-                return True
-        return False
+        self._ensure_index()
+        ilocs = self._name_to_iloc
+        if start not in ilocs or end not in ilocs:
+            return False
+        if visited:
+            # As in the original recursive version, the start vertex is always expanded
+            # even if the caller already lists it as visited
+            seen = bytearray(len(ilocs))
+            for v in visited:
+                if v in ilocs and v != start:
+                    seen[ilocs[v]] = 1
+            return _reach(self._indptr, self._indices, ilocs[start], ilocs[end], seen)
+        if self._closure is None:
+            return _reach(self._indptr, self._indices, ilocs[start], ilocs[end], bytearray(len(ilocs)))
+        scc_of, reach = self._closure
+        return bool(reach[scc_of[ilocs[start]]] >> scc_of[ilocs[end]] & 1)
+
+    def precompute_reachability(self) -> None:
+        """
+        Precompute the full reachability closure so that later path_exists calls are
+        O(1) bit tests. It needs O(V^2) bits, so only use it for many queries on a
+        graph of moderate size; it is discarded whenever the edges change.
+        """
+        self._ensure_index()
+        if self._closure is None:
+            self._closure = _transitive_closure(self._indptr, self._indices)
 
     def collapse_hyper_vertex(self, name: str) -> None:
         """
@@ -73,20 +238,43 @@ class HAG:
         """
         if name not in self._hyper_vertices:
             return
-        members = self._hyper_vertices[name]
-        new_edges = set()
-        for v1, v2, label in self._edges:
-            nv1 = name if v1 in members else v1
-            nv2 = name if v2 in members else v2
-            new_edges.add((nv1, nv2, label))
-        self._edges = new_edges
+        members = frozenset(self._hyper_vertices[name])
+        touched = [e for e in self._edges if e[0] in members or e[1] in members]
+        if touched:
+            self._edges.difference_update(touched)
+            self._edges |= {
+                (name if v1 in members else v1, name if v2 in members else v2, label)
+                for v1, v2, label in touched
+            }
+            self._indptr = None
         self._vertices.difference_update(members)
         self._vertices.add(name)
+        self._version += 1
 
     # ----------------------------
     # Static Visualization
     # ----------------------------
 
+    def _layout(self) -> Tuple[nx.DiGraph, Dict[str, Tuple[float, float]], Dict[Tuple[str, str], str]]:
+        """Return the NetworkX graph, its layout and edge labels, reusing them while the HAG is unchanged."""
+        if self._nx_cache is None or self._nx_cache[0] != self._version:
+            G = nx.DiGraph()
+            G.add_nodes_from(self._vertices)
+            edges_for_G = []
+            edge_labels = {}
+            for u, v, lbl in self._edges:
+                edges_for_G.append((u, v, {'label': lbl}))
+                if lbl:
+                    edge_labels[(u, v)] = lbl
+            G.add_edges_from(edges_for_G)
+            if len(G) > SPRING_LAYOUT_MAX_NODES:
+                pos = nx.random_layout(G, seed=42)
+            else:
+                pos = nx.spring_layout(G, seed=42)
+            self._nx_cache = (self._version, G, pos, edge_labels)
+        _, G, pos, edge_labels = self._nx_cache
+        return G, pos, edge_labels
+
     def draw(self, show_labels: bool = True, highlight_hyper: bool = True, save_as: Optional[str] = None) -> None:
         """
         Render the graph using NetworkX + Matplotlib.
@@ -95,19 +283,7 @@ class HAG:
             highlight_hyper: mark hyper-vertices in red
             save_as: save image (e.g., 'graph.png', 'graph.pdf')
         """
-        G = nx.DiGraph()
-        labels = {}
-
-        # Add nodes and edges
-        for v in self._vertices:
-            G.add_node(v)
-            labels[v] = v
-        for u, v, lbl in self._edges:
-            G.add_edge(u, v)
-            if lbl:
-                labels[(u, v)] = lbl
-
-        pos = nx.spring_layout(G, seed=42)
+        G, pos, edge_labels = self._layout()
 
         nx.draw_networkx_nodes(G, pos, node_color='skyblue', node_size=800, alpha=0.8)
         nx.draw_networkx_edges(G, pos, edge_color='gray', arrows=True)
@@ -115,7 +291,6 @@ class HAG:
         if show_labels:
             nx.draw_networkx_labels(G, pos, font_size=10)
 
-        edge_labels = {(u, v): l for (u, v, l) in self._edges if l}
         nx.draw_networkx_edge_labels(G, pos, edge_labels=edge_labels, font_color='green')
 
         if highlight_hyper:
@@ -174,10 +349,15 @@ class HAG:
     # ----------------------------
 
     def __str__(self) -> str:
+        if self._str_cache is None or self._str_cache[0] != self._version:
+            vertices = ", ".join(map(str, sorted(self._vertices)))
+            edges = "".join(f"\n  {s} -{l}-> {t}" for s, t, l in sorted(self._edges))
+            self._str_cache = (self._version, vertices, edges)
+        _, vertices, edges = self._str_cache
         return (
             f"HAG Model\n"
-            f"Vertices: {sorted(self._vertices)}\n"
-            f"Edges: {sorted(self._edges)}\n"
+            f"Vertices: {vertices}\n"
+            f"Edges:{edges}\n"
             f"Hyper-Vertices: {self._hyper_vertices}\n"
             f"Constraints: {self._constraints}"
         )